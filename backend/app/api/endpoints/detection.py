@@ -3,6 +3,7 @@ from typing import List, Optional
 from pydantic import BaseModel
 import asyncio
 import json
+from ...core.detections import DetectionBatch
 
 router = APIRouter()
 
@@ -25,18 +26,9 @@ async def websocket_live(websocket: WebSocket):
     try:
         while True:
             # Simulate receiving detections and sending them to the client
-            mock_data = {
-                "detections": [
-                    {
-                        "id": "det_001",
-                        "type": "car",
-                        "confidence": 0.98,
-                        "bbox": {"x": 120, "y": 80, "width": 150, "height": 100}
-                    }
-                ],
-                "timestamp": "2024-01-15T14:32:00Z" # You should generate real timestamp
-            }
-            await websocket.send_json(mock_data)
+            batch = DetectionBatch("2024-01-15T14:32:00Z") # You should generate real timestamp
+            batch.append("det_001", "car", 0.98, 120, 80, 150, 100)
+            await websocket.send_text(batch.to_json())
             await asyncio.sleep(0.033) # Simulate 30fps
     except Exception as e:
         print(f"WebSocket closed: {e}")
@@ -10,7 +10,16 @@ router = APIRouter()
 
 # --- Configuration ---
 UPLOAD_DIR = "uploads/sos-recordings"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+_upload_dir_ready = False
+
+def ensure_upload_dir():
+    """
+    Create the upload directory on first use instead of at import time.
+    """
+    global _upload_dir_ready
+    if not _upload_dir_ready:
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        _upload_dir_ready = True
 
 # --- Models ---
 class SOSRecording(BaseModel):
@@ -48,6 +57,7 @@ async def create_sos_recording(
     file_name = f"{recording_id}{file_extension}"
     file_path = os.path.join(UPLOAD_DIR, file_name)
 
+    ensure_upload_dir()
     try:
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(video.file, buffer)
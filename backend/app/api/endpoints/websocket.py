@@ -4,6 +4,7 @@ import json
 import asyncio
 import random
 from datetime import datetime
+from ...core.detections import DetectionBatch
 
 router = APIRouter()
 
@@ -88,22 +89,20 @@ async def websocket_endpoint(websocket: WebSocket):
             
             timestamp = datetime.now().isoformat()
             
-            payload = {
-                "type": "detection",
-                "data": {
-                    "id": f"det_{random.randint(1000, 9999)}",
-                    "type": random.choice(["car", "truck", "motorcycle"]),
-                    "confidence": round(random.uniform(0.85, 0.99), 2),
-                     "bbox": {
-                        "x": random.randint(100, 600),
-                        "y": random.randint(100, 400),
-                        "width": random.randint(100, 200),
-                        "height": random.randint(80, 150)
-                    }
-                },
-                "timestamp": timestamp
-            }
-            await websocket.send_json(payload)
+            batch = DetectionBatch(timestamp)
+            batch.append(
+                f"det_{random.randint(1000, 9999)}",
+                random.choice(["car", "truck", "motorcycle"]),
+                round(random.uniform(0.85, 0.99), 2),
+                random.randint(100, 600),
+                random.randint(100, 400),
+                random.randint(100, 200),
+                random.randint(80, 150)
+            )
+            # One message per detection, serialized straight from the batch.
+            envelope_tail = f',"timestamp":{json.dumps(timestamp)}}}'
+            for i in range(len(batch)):
+                await websocket.send_text('{"type":"detection","data":' + batch.item_json(i) + envelope_tail)
             await asyncio.sleep(0.1) # 10 updates per second
             
     except WebSocketDisconnect:
@@ -0,0 +1,277 @@
+"""
+Admission control for write and upload endpoints.
+
+Every request that matches a `RoutePolicy` has to pass two checks before it
+reaches the router:
+
+1. Token buckets, one per route and one per (route, client), that bound the
+   request rate. Over-rate requests are rejected before the body is read.
+2. A slot in a shared `PriorityPool`, which bounds concurrency with a limited
+   queue. Some slots are reserved for critical traffic. When the queue is full,
+   a higher-priority arrival evicts the lowest-priority waiter. This lets SOS
+   uploads get ahead of analytics exports.
+
+Rejected requests get a 429 response with a Retry-After header.
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# --- Priorities (lower value wins) ---
+CRITICAL = 0
+HIGH = 1
+NORMAL = 2
+LOW = 3
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `capacity`.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def wait(self, now: float) -> float:
+        """
+        Refill, then return 0 if a token is available, or the seconds until one is.
+        Does not consume the token; call `take()` once every check has passed.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class PriorityPool:
+    """
+    Concurrency limiter with a bounded priority queue.
+
+    `reserved` slots can only be used by CRITICAL requests. Waiters are served
+    by priority and then in arrival order. When the queue is full, a new request
+    evicts the worst queued waiter if that waiter has lower priority. Otherwise
+    the new request is rejected.
+    """
+
+    def __init__(self, capacity: int, max_queue: int, reserved: int = 0, queue_timeout: float = 10.0, retry_after: float = 1.0):
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.reserved = reserved
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_use = 0
+        self.queued = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _has_room(self, priority: int) -> bool:
+        limit = self.capacity if priority == CRITICAL else self.capacity - self.reserved
+        return self.in_use < limit
+
+    def _head_priority(self) -> Optional[int]:
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        return self._waiters[0][0] if self._waiters else None
+
+    def _evict_worst(self, priority: int) -> bool:
+        live = [w for w in self._waiters if not w[2].done()]
+        if not live:
+            return False
+        worst = max(live, key=lambda w: (w[0], w[1]))
+        if worst[0] <= priority:
+            return False
+        worst[2].set_exception(Rejected("Preempted by higher-priority request", self.retry_after))
+        self.queued -= 1
+        return True
+
+    def _dispatch(self):
+        while True:
+            head = self._head_priority()
+            if head is None or not self._has_room(head):
+                return
+            _, _, future = heapq.heappop(self._waiters)
+            self.queued -= 1
+            self.in_use += 1
+            future.set_result(None)
+
+    async def acquire(self, priority: int):
+        head = self._head_priority()
+        if self._has_room(priority) and (head is None or head > priority):
+            self.in_use += 1
+            return
+
+        if self.queued >= self.max_queue and not self._evict_worst(priority):
+            raise Rejected("Too many queued requests", self.retry_after)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self.queued -= 1
+                raise Rejected("Timed out waiting for capacity", self.retry_after)
+            # Granted at the same moment the timeout fired.
+            if future.exception() is not None:
+                raise future.exception()
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+                self.queued -= 1
+            elif not future.cancelled() and future.exception() is None:
+                self.release()
+            raise
+
+    def release(self):
+        self.in_use -= 1
+        self._dispatch()
+
+
+class RoutePolicy:
+    """
+    Admission rules for one method and path.
+
+    `path` must be the route's canonical form, including the trailing slash
+    for routes declared as "/". Only exact matches are admitted, so the
+    slash-less request that FastAPI answers with a 307 redirect is not
+    charged. The redirected request is charged once.
+    """
+
+    def __init__(self, name: str, method: str, path: str, priority: int, pool: str,
+                 rate: float, burst: float, client_rate: float, client_burst: float):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.priority = priority
+        self.pool = pool
+        self.rate = rate
+        self.burst = burst
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+
+    def matches(self, method: str, path: str) -> bool:
+        return method == self.method and path == self.path
+
+
+# --- Configuration ---
+DEFAULT_POOLS = {
+    "io": {"capacity": 8, "max_queue": 16, "reserved": 2},
+}
+
+DEFAULT_POLICIES = [
+    RoutePolicy("sos", "POST", "/api/sos-recordings/", CRITICAL, "io", rate=20, burst=40, client_rate=1, client_burst=5),
+    RoutePolicy("incidents", "POST", "/api/incidents/", HIGH, "io", rate=20, burst=40, client_rate=2, client_burst=10),
+    RoutePolicy("chat", "POST", "/api/chat/", NORMAL, "io", rate=10, burst=20, client_rate=1, client_burst=5),
+    RoutePolicy("detection-config", "POST", "/api/detection/config", NORMAL, "io", rate=5, burst=10, client_rate=1, client_burst=3),
+    RoutePolicy("analytics-export", "GET", "/api/analytics/export", LOW, "io", rate=5, burst=10, client_rate=0.5, client_burst=3),
+]
+
+# Per-client buckets are kept in LRU order; the least recently used one is
+# dropped once this many are tracked. A dropped client starts again with a full
+# bucket, and the route bucket still bounds the total rate.
+MAX_CLIENT_BUCKETS = 10000
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware, so a slot is held while an upload body is read and
+    while a streaming response is sent.
+    """
+
+    def __init__(self, app, policies: Optional[List[RoutePolicy]] = None, pools: Optional[Dict[str, dict]] = None):
+        self.app = app
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+        self.pools = {name: PriorityPool(**config) for name, config in (pools or DEFAULT_POOLS).items()}
+        self._route_buckets: Dict[str, TokenBucket] = {}
+        self._client_buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+
+    def _match(self, scope) -> Optional[RoutePolicy]:
+        method = scope["method"]
+        path = scope["path"]
+        return next((p for p in self.policies if p.matches(method, path)), None)
+
+    def _check_rate(self, policy: RoutePolicy, client: str):
+        now = time.monotonic()
+        route_bucket = self._route_buckets.get(policy.name)
+        if route_bucket is None:
+            route_bucket = self._route_buckets[policy.name] = TokenBucket(policy.rate, policy.burst, now)
+
+        key = (policy.name, client)
+        client_bucket = self._client_buckets.get(key)
+        if client_bucket is None:
+            if len(self._client_buckets) >= MAX_CLIENT_BUCKETS:
+                self._client_buckets.popitem(last=False)
+            client_bucket = self._client_buckets[key] = TokenBucket(policy.client_rate, policy.client_burst, now)
+        else:
+            self._client_buckets.move_to_end(key)
+
+        # Check both buckets before charging either, so a request rejected by
+        # the route limit does not cost the client a token.
+        wait = client_bucket.wait(now)
+        if wait:
+            raise Rejected("Client rate limit exceeded", wait)
+        wait = route_bucket.wait(now)
+        if wait:
+            raise Rejected("Route rate limit exceeded", wait)
+        client_bucket.take()
+        route_bucket.take()
+
+    async def _reject(self, send, error: Rejected):
+        body = json.dumps({"detail": error.reason}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(error.retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policy = self._match(scope)
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_id = client[0] if client else "unknown"
+        pool = self.pools[policy.pool]
+        try:
+            self._check_rate(policy, client_id)
+            await pool.acquire(policy.priority)
+        except Rejected as e:
+            await self._reject(send, e)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release()
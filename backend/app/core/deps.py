@@ -0,0 +1,102 @@
+"""
+Lazy loading of heavy third-party dependencies.
+
+Endpoint modules must not import ultralytics, cv2, reportlab, openpyxl,
+openai or google.generativeai at module level. Use `load()` at the point of
+first use instead, and let `warm_up()` pull them in from a background thread
+once the server is already accepting requests.
+"""
+import asyncio
+import importlib
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Optional
+
+# --- Configuration ---
+HEAVY_MODULES = {
+    "ultralytics": "ultralytics",
+    "cv2": "cv2",
+    "reportlab": "reportlab.pdfgen.canvas",
+    "openpyxl": "openpyxl",
+    "openai": "openai",
+    "genai": "google.generativeai",
+}
+
+# Set WARMUP_ON_STARTUP=0 to skip the background warm-up (e.g. in one-off scripts).
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") != "0"
+
+# --- State ---
+_modules: Dict[str, ModuleType] = {}
+_errors: Dict[str, str] = {}
+_load_times: Dict[str, float] = {}
+# One lock per dependency, so loading openpyxl never waits on ultralytics.
+_locks = {name: threading.Lock() for name in HEAVY_MODULES}
+_warmup_done = False
+
+
+def load(name: str) -> ModuleType:
+    """
+    Import a heavy dependency by its alias in HEAVY_MODULES on first use.
+    Raises ImportError if the package is not installed, or whatever the
+    package itself raised if it failed during import.
+    """
+    module = _modules.get(name)
+    if module is not None:
+        return module
+
+    with _locks[name]:
+        if name in _modules:
+            return _modules[name]
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(HEAVY_MODULES[name])
+        except Exception as e:
+            _errors[name] = f"{type(e).__name__}: {e}"
+            raise
+        _modules[name] = module
+        _errors.pop(name, None)
+        _load_times[name] = round((time.perf_counter() - started) * 1000, 1)
+        return module
+
+
+def try_load(name: str) -> Optional[ModuleType]:
+    """
+    Like `load()`, but returns None when the dependency is unavailable or
+    fails to import. The error is recorded in `status()["unavailable"]`.
+    """
+    try:
+        return load(name)
+    except Exception:
+        return None
+
+
+def _warm_up_sync():
+    for name in HEAVY_MODULES:
+        try_load(name)
+
+
+async def warm_up():
+    """
+    Import every heavy dependency in a worker thread so the event loop
+    keeps serving requests. Import failures are recorded per module, not
+    raised, so one broken package does not stop the rest from loading.
+    """
+    global _warmup_done
+    try:
+        await asyncio.to_thread(_warm_up_sync)
+    finally:
+        _warmup_done = True
+
+
+def is_ready() -> bool:
+    return _warmup_done or not WARMUP_ON_STARTUP
+
+
+def status() -> dict:
+    return {
+        "ready": is_ready(),
+        "loaded": dict(_load_times),
+        "unavailable": dict(_errors),
+    }
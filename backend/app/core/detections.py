@@ -0,0 +1,168 @@
+"""
+Compact internal representation for per-frame detections.
+
+A `DetectionBatch` holds one frame's detections as parallel arrays
+(struct-of-arrays) instead of a list of dicts or Pydantic models. Builders on
+the hot path append into the arrays, and the batch is serialized straight to
+the public `DetectionLive` JSON shape.
+"""
+import json
+import math
+import threading
+from array import array
+from typing import Iterable, List, Mapping, Optional, Sequence, Union
+
+# Vehicle classes are stored as small integer codes into this table. Names not
+# listed here are added on first use, so any `Detection.type` string is accepted.
+# The table is process-wide, mutable and only grows, so it is capped at
+# MAX_CLASS_NAMES entries; names past the cap are rejected with ValueError.
+CLASS_NAMES: List[str] = ["car", "truck", "motorcycle", "bus", "bike"]
+MAX_CLASS_NAMES = 1024
+_CLASS_CODES = {name: code for code, name in enumerate(CLASS_NAMES)}
+_class_lock = threading.Lock()
+
+
+def class_code(name: str) -> int:
+    """
+    Code for a class name, interning names that have not been seen before.
+    """
+    code = _CLASS_CODES.get(name)
+    if code is None:
+        with _class_lock:
+            code = _CLASS_CODES.get(name)
+            if code is None:
+                if len(CLASS_NAMES) >= MAX_CLASS_NAMES:
+                    raise ValueError(f"Class table is full ({MAX_CLASS_NAMES} names); cannot add {name!r}")
+                code = len(CLASS_NAMES)
+                CLASS_NAMES.append(name)
+                _CLASS_CODES[name] = code
+    return code
+
+
+def _number(value: float) -> str:
+    # Whole-pixel coordinates serialize as integers, as the mock payloads did.
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _id_string(value) -> str:
+    # Tracker ids often arrive as floats (YOLO `boxes.id`); 7.0 becomes "7".
+    if isinstance(value, str):
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return str(int(number)) if number.is_integer() else repr(number)
+
+
+class DetectionBatch:
+    """
+    One frame of detections. `boxes` stores the top-left x, y, width and
+    height of each detection back to back, so detection `i` lives at
+    `boxes[4*i:4*i+4]`.
+    """
+    __slots__ = ("timestamp", "ids", "class_codes", "confidences", "boxes")
+
+    def __init__(self, timestamp: str):
+        self.timestamp = timestamp
+        self.ids: List[str] = []
+        self.class_codes = array("H")
+        self.confidences = array("d")
+        self.boxes = array("d")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, id: str, type: str, confidence: float, x: float, y: float, width: float, height: float):
+        if not all(map(math.isfinite, (confidence, x, y, width, height))):
+            raise ValueError(f"Detection {id} has a non-finite confidence or bbox value")
+        code = class_code(type)
+        self.ids.append(id)
+        self.class_codes.append(code)
+        self.confidences.append(confidence)
+        self.boxes.extend((x, y, width, height))
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamp: str,
+        ids: Iterable,
+        classes: Iterable,
+        confidences: Iterable[float],
+        boxes: Iterable[float],
+        class_names: Optional[Union[Sequence[str], Mapping[int, str]]] = None,
+    ) -> "DetectionBatch":
+        """
+        Build a batch from detector output that is already column-shaped.
+
+        `classes` are indices into `class_names`, the detector's own label
+        table (for a YOLO result, `result.names`). Without `class_names` they
+        must already be codes from `CLASS_NAMES`. Float indices, as in YOLO's
+        `cls` column, are truncated to int. `ids` are converted to strings, so
+        numeric tracker ids serialize as the `Detection.id` string. `boxes` is
+        flat top-left x, y, width, height per detection.
+        """
+        batch = cls(timestamp)
+        batch.ids = [_id_string(i) for i in ids]
+        try:
+            classes = [int(c) for c in classes]
+            if class_names is None:
+                known = len(CLASS_NAMES)
+                if any(not 0 <= c < known for c in classes):
+                    raise IndexError
+                batch.class_codes = array("H", classes)
+            else:
+                batch.class_codes = array("H", (class_code(class_names[c]) for c in classes))
+        except (IndexError, KeyError, TypeError, ValueError, OverflowError):
+            raise ValueError("Detection class index is not in the class table") from None
+        batch.confidences = array("d", confidences)
+        batch.boxes = array("d", boxes)
+        if not (len(batch.ids) == len(batch.class_codes) == len(batch.confidences) == len(batch.boxes) / 4):
+            raise ValueError("Detection columns have mismatched lengths")
+        if not (all(map(math.isfinite, batch.confidences)) and all(map(math.isfinite, batch.boxes))):
+            raise ValueError("Detection columns contain non-finite values")
+        return batch
+
+    def item_payload(self, i: int) -> dict:
+        """
+        Plain-dict form of detection `i`, matching the `Detection` schema.
+        """
+        b = 4 * i
+        x, y, width, height = (int(v) if v.is_integer() else v for v in self.boxes[b:b + 4])
+        return {
+            "id": self.ids[i],
+            "type": CLASS_NAMES[self.class_codes[i]],
+            "confidence": self.confidences[i],
+            "bbox": {"x": x, "y": y, "width": width, "height": height},
+        }
+
+    def item_json(self, i: int) -> str:
+        """
+        JSON for detection `i` in the `Detection` shape, written straight from
+        the arrays.
+        """
+        b = 4 * i
+        boxes = self.boxes
+        return (
+            f'{{"id":{json.dumps(self.ids[i])},"type":{json.dumps(CLASS_NAMES[self.class_codes[i]])},'
+            f'"confidence":{self.confidences[i]!r},'
+            f'"bbox":{{"x":{_number(boxes[b])},"y":{_number(boxes[b + 1])},'
+            f'"width":{_number(boxes[b + 2])},"height":{_number(boxes[b + 3])}}}}}'
+        )
+
+    def to_payload(self) -> dict:
+        """
+        Plain-dict form of the whole frame, matching the `DetectionLive` schema.
+        """
+        return {
+            "detections": [self.item_payload(i) for i in range(len(self.ids))],
+            "timestamp": self.timestamp,
+        }
+
+    def to_json(self) -> str:
+        """
+        Serialize directly to the `DetectionLive` JSON shape without building
+        intermediate dicts per detection.
+        """
+        parts = ",".join([self.item_json(i) for i in range(len(self.ids))])
+        return f'{{"detections":[{parts}],"timestamp":{json.dumps(self.timestamp)}}}'
@@ -1,8 +1,26 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from .api.endpoints import dashboard, detection, incidents, analytics, chat, sos, reports, websocket
+from .core import deps
+from .core.admission import AdmissionMiddleware
 
-app = FastAPI(title="Traffic Signal Detection System API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy dependencies are imported in the background so the worker starts
+    # serving /health immediately; /ready reports when warm-up has finished.
+    warmup_task = asyncio.create_task(deps.warm_up()) if deps.WARMUP_ON_STARTUP else None
+    yield
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+
+app = FastAPI(title="Traffic Signal Detection System API", version="1.0.0", lifespan=lifespan)
+
+# Admission control for write and upload endpoints. Added before CORS so that
+# 429 responses still carry CORS headers.
+app.add_middleware(AdmissionMiddleware)
 
 # Configure CORS
 origins = [
@@ -35,3 +53,8 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/ready")
+def readiness_check():
+    status = deps.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
@@ -0,0 +1,126 @@
+"""
+Synthetic overload benchmark for admission control.
+
+Drives the ASGI stack directly, with no server or network, using a fake
+backend that models the worker threadpool as a semaphore. A flood of analytics
+exports and incident writes arrives alongside a steady stream of SOS uploads
+and live-stream frames. The run is repeated with and without
+`AdmissionMiddleware`, and the benchmark reports latency and 429 counts per
+traffic class. Run from the backend directory:
+
+    python benchmarks/bench_admission.py --duration 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.admission import AdmissionMiddleware  # noqa: E402
+
+THREADPOOL_SIZE = 40
+
+# Seconds a request holds a worker thread, by path.
+SERVICE_TIME = {
+    "/api/sos-recordings/": 0.20,
+    "/api/incidents/": 0.05,
+    "/api/analytics/export": 0.50,
+}
+
+
+class FakeBackend:
+    def __init__(self):
+        self.threadpool = asyncio.Semaphore(THREADPOOL_SIZE)
+
+    async def __call__(self, scope, receive, send):
+        async with self.threadpool:
+            await asyncio.sleep(SERVICE_TIME[scope["path"]])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def request(app, method, path, client, results, name):
+    scope = {"type": "http", "method": method, "path": path, "client": (client, 50000), "headers": []}
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    results.setdefault(name, []).append((status["code"], time.perf_counter() - started))
+
+
+async def live_stream(backend, duration, waits):
+    # One frame every 33 ms needs a worker thread briefly.
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        started = time.perf_counter()
+        async with backend.threadpool:
+            waits.append(time.perf_counter() - started)
+        await asyncio.sleep(0.033)
+
+
+async def run(with_admission, duration, seed):
+    rng = random.Random(seed)
+    backend = FakeBackend()
+    app = AdmissionMiddleware(backend) if with_admission else backend
+    results, live_waits, tasks = {}, [], []
+
+    tasks.append(asyncio.create_task(live_stream(backend, duration, live_waits)))
+    end = time.perf_counter() + duration
+    tick = 0
+    while time.perf_counter() < end:
+        # Overload: ~400 exports/s and ~200 incident writes/s from 200 clients.
+        for _ in range(20):
+            tasks.append(asyncio.create_task(request(app, "GET", "/api/analytics/export", f"10.0.1.{rng.randrange(200)}", results, "exports")))
+        for _ in range(10):
+            tasks.append(asyncio.create_task(request(app, "POST", "/api/incidents/", f"10.0.2.{rng.randrange(200)}", results, "incidents")))
+        # SOS: ~10 uploads/s, each from a different device.
+        if tick % 5 == 0:
+            tasks.append(asyncio.create_task(request(app, "POST", "/api/sos-recordings/", f"10.0.3.{tick % 250}", results, "sos")))
+        tick += 1
+        await asyncio.sleep(0.05)
+    await asyncio.gather(*tasks)
+    return results, live_waits
+
+
+def p(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def report(label, results, live_waits):
+    print(f"\n{label}")
+    print(f"{'class':<12}{'ok':>7}{'429':>7}{'p50 ms':>10}{'p99 ms':>10}")
+    for name in ("sos", "incidents", "exports"):
+        rows = results.get(name, [])
+        ok = [t for code, t in rows if code == 200]
+        rejected = sum(1 for code, _ in rows if code == 429)
+        print(f"{name:<12}{len(ok):>7}{rejected:>7}{p(ok, 0.5) * 1000:>10.1f}{p(ok, 0.99) * 1000:>10.1f}")
+    print(f"{'live frame':<12}{len(live_waits):>7}{'-':>7}{statistics.median(live_waits) * 1000:>10.1f}{p(live_waits, 0.99) * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of offered load per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for with_admission in (False, True):
+        results, live_waits = asyncio.run(run(with_admission, args.duration, args.seed))
+        report("with admission control" if with_admission else "without admission control", results, live_waits)
+
+
+if __name__ == "__main__":
+    main()
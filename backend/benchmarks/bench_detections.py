@@ -0,0 +1,119 @@
+"""
+Microbenchmark for per-frame detection handling.
+
+Compares the Pydantic path (one `Detection` model per detection wrapped in a
+`DetectionLive`, then serialized) against `DetectionBatch.to_json()`. Reports
+serialize time per frame and, via tracemalloc, the peak bytes allocated while
+building and serializing one frame and the bytes retained by a buffered frame.
+Run from the backend directory:
+
+    python benchmarks/bench_detections.py --detections 50 --frames 3000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.endpoints.detection import Detection, DetectionLive  # noqa: E402
+from app.core.detections import CLASS_NAMES, DetectionBatch  # noqa: E402
+
+TIMESTAMP = "2024-01-15T14:32:00Z"
+
+
+def make_rows(n):
+    rng = random.Random(0)
+    return [
+        (
+            f"det_{i:04d}",
+            rng.choice(CLASS_NAMES),
+            round(rng.uniform(0.8, 0.99), 2),
+            rng.randint(0, 600),
+            rng.randint(0, 400),
+            rng.randint(50, 200),
+            rng.randint(50, 150),
+        )
+        for i in range(n)
+    ]
+
+
+def build_models(rows):
+    return DetectionLive(
+        detections=[
+            Detection(id=id, type=type, confidence=conf, bbox={"x": x, "y": y, "width": w, "height": h})
+            for id, type, conf, x, y, w, h in rows
+        ],
+        timestamp=TIMESTAMP,
+    )
+
+
+def build_batch(rows):
+    batch = DetectionBatch(TIMESTAMP)
+    for row in rows:
+        batch.append(*row)
+    return batch
+
+
+def frame_models(rows):
+    return build_models(rows).model_dump_json()
+
+
+def frame_batch(rows):
+    return build_batch(rows).to_json()
+
+
+def time_per_frame(fn, rows, frames):
+    started = time.perf_counter()
+    for _ in range(frames):
+        fn(rows)
+    return (time.perf_counter() - started) / frames
+
+
+def peak_bytes_per_frame(fn, rows):
+    fn(rows)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base
+
+
+def retained_bytes_per_frame(build, rows, frames=100):
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    held = [build(rows) for _ in range(frames)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return (current - base) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--detections", type=int, default=50, help="Detections per frame")
+    parser.add_argument("--frames", type=int, default=3000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.detections)
+    assert DetectionLive.model_validate_json(frame_batch(rows)) == build_models(rows)
+
+    results = [
+        ("pydantic", frame_models, build_models),
+        ("batch", frame_batch, build_batch),
+    ]
+    print(f"{args.detections} detections/frame, {args.frames} frames")
+    print(f"{'path':<10}{'us/frame':>12}{'peak KiB/frame':>18}{'held KiB/frame':>18}")
+    for name, frame, build in results:
+        per_frame = time_per_frame(frame, rows, args.frames)
+        peak = peak_bytes_per_frame(frame, rows)
+        held = retained_bytes_per_frame(build, rows)
+        print(f"{name:<10}{per_frame * 1e6:>12.1f}{peak / 1024:>18.1f}{held / 1024:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Import-time benchmark for the API worker.
+
+Measures how long a fresh interpreter takes to import `app.main` and checks
+that none of the heavy dependencies in `app.core.deps.HEAVY_MODULES` were
+pulled in eagerly. Run from the backend directory:
+
+    python benchmarks/bench_import_time.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+from app.core.deps import HEAVY_MODULES
+eager = [m for m in HEAVY_MODULES.values() if m in sys.modules]
+print(json.dumps({"seconds": elapsed, "eager": eager}))
+"""
+
+
+def run_once():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="Fail if the median exceeds this many seconds")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    timings = [s["seconds"] for s in samples]
+    eager = sorted({m for s in samples for m in s["eager"]})
+    median = statistics.median(timings)
+
+    print(f"import app.main: median {median * 1000:.1f} ms, min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms over {args.runs} runs")
+    if eager:
+        print(f"Heavy modules imported eagerly: {', '.join(eager)}")
+    if eager or median > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()